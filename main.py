@@ -1,6 +1,9 @@
 import argparse
-import os
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
 
+import urllib3
 from loguru import logger
 from ynab.api.transactions_api import TransactionsApi
 from ynab.api_client import ApiClient
@@ -11,6 +14,8 @@ from ynab.models.post_transactions_wrapper import PostTransactionsWrapper
 from ynab.models.save_sub_transaction import SaveSubTransaction
 
 from invoice_scrapper import InvoiceScrapper
+from routing import Router
+from run_report import InvoiceReport, ReportWriter
 from utils import setup_logging
 
 parser = argparse.ArgumentParser(
@@ -21,7 +26,8 @@ parser.add_argument(
     "-f",
     "--invoice_file",
     type=str,
-    help="Path to the PDF file to use",
+    nargs="+",
+    help="Path to the PDF or PNG files to use",
     required=True,
 )
 parser.add_argument(
@@ -47,91 +53,190 @@ parser.add_argument(
     help="Dry run: do not send data to YNAB",
 )
 
-args = parser.parse_args()
-invoice_file: str = args.invoice_file
-ynab_access_token: str = args.token
-setup_logging(args.debug)
+parser.add_argument(
+    "--report",
+    type=str,
+    help="Append a JSON line run report for each invoice to this file.",
+    default=None,
+)
 
-invoice = InvoiceScrapper.get_invoice(invoice_file)
-
-try:
-    budget_id = os.environ["BUDGET_ID"]
-    account_id = os.environ["ACCOUNT_ID"]
-    category_id = os.environ["CATEGORY_ID"]
-    sub_category_id = os.environ["SUB_CATEGORY_ID"]
-    if invoice.supermarket == "Consum":
-        payee_id = os.environ["PAYEE_ID_CONSUM"]
-    elif invoice.supermarket == "Mercadona":
-        payee_id = os.environ["PAYEE_ID_MERCADONA"]
-except KeyError as e:
-    raise SystemExit(logger.error(f"Please set environment variables: {e}"))
-
-producs = invoice.products
-invoice_number = invoice.invoice_number
-payment_date = invoice.payment_date
-total = invoice.total
-
-configuration = Configuration(access_token=ynab_access_token)
-data = PostTransactionsWrapper(
-    transaction=NewTransaction(
-        account_id=account_id,
-        date=invoice.payment_date.date(),
-        amount=int(-invoice.total * 1000),
-        payee_id=payee_id,
-        category_id=category_id,
-        memo=f"YNAB API: Factura={invoice.invoice_number}",
-        approved=True,
-        subtransactions=[
-            SaveSubTransaction(
-                amount=int(round(-product.total_price * 1000, 2)),
-                category_id=sub_category_id,
-                memo=f"{product.name} {product.unit}".capitalize().strip(),
-            )
-            for product in invoice.products
-        ],
+parser.add_argument(
+    "-c",
+    "--routes",
+    type=str,
+    help=(
+        "JSON routing file mapping supermarket and folder to budget, account "
+        "and payee.  Default: BUDGET_ID, ACCOUNT_ID, ... environment variables."
     ),
+    default=None,
 )
 
+args = parser.parse_args()
+invoice_files: List[str] = args.invoice_file
+ynab_access_token: str = args.token
+setup_logging(args.debug)
 
-[logger.debug(i) for i in invoice.products]
-sum_total = round(sum([i.total_price for i in invoice.products]), 2)
 
-if total != sum_total:
-    raise SystemExit(logger.error(f"ERROR: Total Missmatch: {total} != {sum_total}"))
+def prepare_invoice(
+    invoice_file: str, report: InvoiceReport, router: Router
+) -> NewTransaction:
+    with report.stage("read"):
+        text = InvoiceScrapper.read_invoice_file(invoice_file)
+    with report.stage("parse"):
+        invoice = InvoiceScrapper.parse_text(text)
+    report.supermarket = invoice.supermarket
+    report.items = len(invoice.products)
+    report.total = total = invoice.total
 
-logger.info(
-    f"Invoice number: {invoice.invoice_number}, Payment date: {invoice.payment_date}"
-)
-logger.success(f"{total=}, {sum_total=}")
+    try:
+        route = router.route(invoice.supermarket, invoice_file)
+    except SystemExit:
+        report.result = "config_error"
+        raise
+    report.budget_id = route.budget_id
+
+    with report.stage("build"):
+        transaction = NewTransaction(
+            account_id=route.account_id,
+            date=invoice.payment_date.date(),
+            amount=int(-invoice.total * 1000),
+            payee_id=route.payee_id,
+            category_id=route.category_id,
+            memo=f"YNAB API: Factura={invoice.invoice_number}",
+            approved=True,
+            subtransactions=[
+                SaveSubTransaction(
+                    amount=int(round(-product.total_price * 1000, 2)),
+                    category_id=route.sub_category_id,
+                    memo=f"{product.name} {product.unit}".capitalize().strip(),
+                )
+                for product in invoice.products
+            ],
+        )
+
+    for product in invoice.products:
+        logger.debug(product)
+    report.sum_total = sum_total = round(
+        sum(i.total_price for i in invoice.products), 2
+    )
 
+    if total != sum_total:
+        report.result = "total_mismatch"
+        raise SystemExit(
+            logger.error(f"ERROR: Total Missmatch: {total} != {sum_total}")
+        )
 
-logger.debug(
-    (
-        "YNAB transation data:",
-        f"{data.transaction.var_date=}, {data.transaction.amount=}, {data.transaction.payee_id=}",
-        f"{data.transaction.category_id=}, {data.transaction.memo=}",
+    logger.info(
+        f"Invoice number: {invoice.invoice_number}, Payment date: {invoice.payment_date}"
     )
-)
-[logger.debug(i) for i in data.transaction.subtransactions]
-
-if args.dry_run:
-    logger.warning(
-        (
-            f"Dry run: not sending data to YNAB. "
-            f"- Date: {data.transaction.var_date} "
-            f"- Subtransaction items: {len(data.transaction.subtransactions)} "
-            f"- Total: {total}"
+    logger.success(f"{total=}, {sum_total=}")
+
+    logger.opt(lazy=True).debug(
+        "{}",
+        lambda: (
+            "YNAB transation data:",
+            f"{transaction.var_date=}, {transaction.amount=}, {transaction.payee_id=}",
+            f"{transaction.category_id=}, {transaction.memo=}",
         ),
     )
-    raise SystemExit(logger.info("Exiting due to dry run mode."))
+    for subtransaction in transaction.subtransactions:
+        logger.debug(subtransaction)
+
+    return transaction
+
 
-# Create a YNAB new transaction
-with ApiClient(configuration) as api_client:
-    trx_api = TransactionsApi(api_client)
+def submit_budget(
+    trx_api: TransactionsApi,
+    budget_id: str,
+    pending: List[Tuple[InvoiceReport, NewTransaction]],
+) -> None:
+    """Post all transactions of a budget in a single bulk request."""
+    data = PostTransactionsWrapper(transactions=[trx for _, trx in pending])
+    start = time.perf_counter()
     try:
         api_response = trx_api.create_transaction(budget_id, data)
-        logger.success(f"YNAB API Response: {api_response.data.transaction_ids}")
+        result = "submitted"
+        logger.success(
+            f"YNAB API Response ({budget_id}): {api_response.data.transaction_ids}"
+        )
     except ApiException as e:
+        result, error = "api_error", str(e).strip()
         logger.error(
             "Exception when calling TransactionsApi->create_transaction: %s\n" % e
         )
+    except (urllib3.exceptions.HTTPError, OSError) as e:
+        result, error = "transport_error", f"{type(e).__name__}: {e}"
+        logger.error(f"YNAB API connection error ({budget_id}): {error}")
+    else:
+        error = ""
+    # Bulk request time split evenly, so report durations add up per batch.
+    elapsed = round((time.perf_counter() - start) / len(pending), 6)
+
+    for report, _ in pending:
+        report.durations["submit"] = elapsed
+        report.result = result
+        report.error = error
+
+
+by_budget: Dict[str, List[Tuple[InvoiceReport, NewTransaction]]] = defaultdict(list)
+failed = 0
+
+with ReportWriter(args.report) as report_writer:
+    config = InvoiceReport(file="", result="config_error")
+    try:
+        with config.capture_errors():
+            router = Router.from_file(args.routes) if args.routes else Router.from_env()
+    except SystemExit:
+        for invoice_file in invoice_files:
+            config.file = invoice_file
+            report_writer.write(config)
+        raise SystemExit(1)
+
+    for invoice_file in invoice_files:
+        report = InvoiceReport(file=invoice_file)
+        transaction = None
+        with report.capture_errors():
+            try:
+                transaction = prepare_invoice(invoice_file, report, router)
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    logger.error(f"{invoice_file}: {e.code}")
+            # One bad receipt or route must not stop the other invoices.
+            except Exception as e:
+                logger.error(f"{invoice_file}: {type(e).__name__}: {e}")
+
+        if transaction is None:
+            failed += 1
+            if report.result == "pending":
+                report.result = "error"
+            report_writer.write(report)
+        else:
+            by_budget[report.budget_id].append((report, transaction))
+
+    if args.dry_run:
+        for budget_id, pending in by_budget.items():
+            logger.warning(
+                (
+                    f"Dry run: not sending data to YNAB. "
+                    f"- Budget: {budget_id} "
+                    f"- Transactions: {len(pending)} "
+                    f"- Total: {round(sum(r.total for r, _ in pending), 2)}"
+                ),
+            )
+            for report, _ in pending:
+                report.result = "dry_run"
+                report_writer.write(report)
+        logger.info("Exiting due to dry run mode.")
+    else:
+        # One pooled HTTP client shared by every budget.
+        with ApiClient(Configuration(access_token=ynab_access_token)) as api_client:
+            trx_api = TransactionsApi(api_client)
+            for budget_id, pending in by_budget.items():
+                submit_budget(trx_api, budget_id, pending)
+                failed += sum(r.result != "submitted" for r, _ in pending)
+                for report, _ in pending:
+                    report_writer.write(report)
+
+if failed:
+    logger.error(f"{failed} of {len(invoice_files)} invoices failed.")
+    raise SystemExit(1)
@@ -0,0 +1,121 @@
+import argparse
+import time
+from collections import Counter
+
+from loguru import logger
+
+from parser_regression import PARSERS, record_case, run_corpus
+from utils import setup_logging
+
+parser = argparse.ArgumentParser(
+    description=(
+        "Invoice parser regression corpus: record cases and compare two parser "
+        "implementations against the expected invoices."
+    )
+)
+parser.add_argument(
+    "-d",
+    "--debug",
+    help="Debug mode: info, debug, trace.  Default is 'info'.",
+    choices=["info", "debug", "trace"],
+    default="info",
+    type=str.lower,
+)
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+record = subparsers.add_parser(
+    "record", help="Add PDF or PNG invoices to the corpus with their parsed invoice."
+)
+record.add_argument("corpus", type=str, help="Corpus directory")
+record.add_argument("invoice_file", type=str, nargs="+", help="Invoice files")
+record.add_argument(
+    "-p",
+    "--parser",
+    type=str,
+    default="regex",
+    help=f"Parser producing the expected invoice: {list(PARSERS)} or module:callable",
+)
+
+compare = subparsers.add_parser(
+    "compare", help="Run parsers side by side over the corpus."
+)
+compare.add_argument("corpus", type=str, help="Corpus directory")
+compare.add_argument(
+    "-p",
+    "--parser",
+    type=str,
+    nargs="+",
+    default=["regex"],
+    help=f"One or two parsers: {list(PARSERS)} or module:callable",
+)
+compare.add_argument(
+    "-w",
+    "--workers",
+    type=int,
+    default=None,
+    help="Worker processes.  Default is the number of CPUs.",
+)
+
+
+def record_corpus(args: argparse.Namespace) -> None:
+    for invoice_file in args.invoice_file:
+        logger.info(f"Recorded {record_case(invoice_file, args.corpus, args.parser)}")
+
+
+def compare_corpus(args: argparse.Namespace) -> int:
+    parsers = tuple(args.parser)
+    if len(parsers) > 2:
+        logger.error("Compare at most two parsers.")
+        raise SystemExit(1)
+
+    cases, failed = 0, 0
+    seconds: Counter = Counter()
+    errors: Counter = Counter()
+    start = time.perf_counter()
+
+    for result in run_corpus(args.corpus, parsers, args.workers):
+        cases += 1
+        seconds.update(result.seconds)
+        errors.update(result.errors.keys())
+        if result.ok:
+            continue
+        failed += 1
+        for name, error in result.errors.items():
+            logger.error(f"{result.case}: {name} failed: {error}")
+        for name, diffs in result.expected_diffs.items():
+            if diffs and name not in result.errors:
+                logger.warning(f"{result.case}: {name} != expected: {diffs}")
+        if result.expected_missing:
+            logger.error(f"{result.case}: expected invoice file missing")
+        if result.parser_diffs:
+            logger.warning(
+                f"{result.case}: {' != '.join(parsers)}: {result.parser_diffs}"
+            )
+
+    elapsed = time.perf_counter() - start
+    if not cases:
+        logger.error(f"No corpus cases found in {args.corpus}")
+        raise SystemExit(1)
+    logger.info(f"{cases} cases, {failed} mismatches, {elapsed:.2f}s wall time.")
+    for name in parsers:
+        logger.info(
+            f"{name}: {seconds[name]:.4f}s parsing, "
+            f"{cases / seconds[name] if seconds[name] else 0:.1f} cases/s, "
+            f"{errors[name]} errors"
+        )
+    if len(parsers) == 2 and seconds[parsers[0]] and seconds[parsers[1]]:
+        logger.info(
+            f"{parsers[1]} speedup over {parsers[0]}: "
+            f"{seconds[parsers[0]] / seconds[parsers[1]]:.2f}x"
+        )
+    return failed
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    setup_logging(args.debug)
+
+    if args.command == "record":
+        record_corpus(args)
+    elif compare_corpus(args):
+        raise SystemExit(1)
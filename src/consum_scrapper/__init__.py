@@ -1,6 +1,5 @@
 import re
 from datetime import datetime
-from typing import List
 
 from invoice_scrapper import InvoiceScrapper
 from models import Invoice, Product
@@ -9,6 +8,14 @@ from models import Invoice, Product
 class ConsumScrapper(InvoiceScrapper):
     """Consum invoice scrapper."""
 
+    SUPERMARKET = "Consum"
+    PRODUCT_PARSERS = (
+        "_get_unitary_products",
+        "_get_multiple_products",
+        "_get_fractional_products",
+        "_get_discount",
+    )
+
     INVOICE_NUMBER_RE = re.compile(
         r"(C:\d+\s\d+\/\d+)\s\d{2}\.\d{2}\.\d{4}\s\d{2}:\d{2}\s(\d+)", re.IGNORECASE
     )
@@ -100,15 +107,6 @@ class ConsumScrapper(InvoiceScrapper):
             ) in cls.DISCOUNT_RE.findall(text)
         ]
 
-    @classmethod
-    def _get_products(cls, text) -> List[Product]:
-        return (
-            cls._get_unitary_products(text)
-            + cls._get_multiple_products(text)
-            + cls._get_fractional_products(text)
-            + cls._get_discount(text)
-        )
-
     @classmethod
     def _get_invoice_number(cls, text) -> str:
         return " - ".join(cls.INVOICE_NUMBER_RE.search(text).groups())
@@ -126,11 +124,4 @@ class ConsumScrapper(InvoiceScrapper):
 
     @classmethod
     def get_invoice(cls, text: str) -> Invoice:
-
-        return Invoice(
-            supermarket=cls.supermarket,
-            products=cls._get_products(text),
-            invoice_number=cls._get_invoice_number(text),
-            payment_date=cls._get_payment_date(text),
-            total=cls._get_invoice_total(text),
-        )
+        return cls.parse_invoice(text)
@@ -1,14 +1,68 @@
+from functools import lru_cache
+from importlib import import_module
+from importlib.metadata import entry_points
 from pathlib import Path
+from typing import List, Tuple, Type
 
 from loguru import logger
 
-from models import Invoice
+from models import Invoice, Product
 from utils import detect_file_type, read_pdf_file, read_png_file
 
+SCRAPPERS_ENTRY_POINT = "mdona_scrapper.scrappers"
+# Same as the pyproject entry points, which are only visible once the package
+# is installed: running main.py from a source checkout still needs them.
+BUILTIN_SCRAPPERS = {
+    "consum": "consum_scrapper:ConsumScrapper",
+    "mercadona": "mdona_scrapper:MercadonaScrapper",
+}
+
+
+def _load(target: str) -> type:
+    module, _, attr = target.partition(":")
+    return getattr(import_module(module), attr)
+
+
+@lru_cache(maxsize=None)
+def load_scrappers() -> Tuple[Type["InvoiceScrapper"], ...]:
+    """Built-in scrappers followed by those registered as entry points.
+
+    Scrappers failing to load or not subclassing InvoiceScrapper are logged
+    and skipped.
+    """
+    scrappers = dict(BUILTIN_SCRAPPERS)
+    eps = entry_points()
+    for ep in (
+        eps.select(group=SCRAPPERS_ENTRY_POINT)
+        if hasattr(eps, "select")
+        else eps.get(SCRAPPERS_ENTRY_POINT, [])
+    ):
+        scrappers[ep.name] = ep
+
+    loaded = []
+    for name, target in scrappers.items():
+        try:
+            scrapper = _load(target) if isinstance(target, str) else target.load()
+        except Exception as e:
+            logger.error(f"Error loading invoice scrapper {name}: {e}")
+            continue
+        if not (isinstance(scrapper, type) and issubclass(scrapper, InvoiceScrapper)):
+            logger.error(
+                f"Invoice scrapper {name} is not an InvoiceScrapper: {scrapper}"
+            )
+            continue
+        loaded.append(scrapper)
+    logger.debug(f"Invoice scrappers: {[s.__name__ for s in loaded]}")
+    return tuple(loaded)
+
 
 class InvoiceScrapper:
+    SUPERMARKET: str = ""
+    # Product extractor classmethods, in output order.
+    PRODUCT_PARSERS: Tuple[str, ...] = ()
+
     @classmethod
-    def _read_invoice_file(cls, invoice_file: str) -> str:
+    def read_invoice_file(cls, invoice_file: str) -> str:
 
         text: str = ""
         if not Path(invoice_file).exists():
@@ -28,17 +82,35 @@ class InvoiceScrapper:
 
     @classmethod
     def get_invoice(cls, invoice_file: str) -> Invoice:
-        text = cls._read_invoice_file(invoice_file)
+        return cls.parse_text(cls.read_invoice_file(invoice_file))
+
+    @classmethod
+    def parse_text(cls, text: str) -> Invoice:
+        t = text.lower()
+        for scrapper in load_scrappers():
+            if scrapper.matches(t):
+                return scrapper.parse_invoice(text)
+        raise SystemExit("Unsupported invoice format or supermarket.")
 
-        if "consum" in (t := text.lower()):
-            from consum_scrapper import ConsumScrapper
+    @classmethod
+    def matches(cls, text: str) -> bool:
+        """Whether this scrapper handles the (lowercase) invoice text."""
+        return bool(cls.SUPERMARKET) and cls.SUPERMARKET.lower() in text
 
-            cls.supermarket = "Consum"
-            return ConsumScrapper.get_invoice(text)
-        elif "mercadona" in t:
-            from mdona_scrapper import MercadonaScrapper
+    @classmethod
+    def _get_products(cls, text: str) -> List[Product]:
+        products: List[Product] = []
+        for parser in cls.PRODUCT_PARSERS:
+            products += getattr(cls, parser)(text)
+        return products
+
+    @classmethod
+    def parse_invoice(cls, text: str) -> Invoice:
 
-            cls.supermarket = "Mercadona"
-            return MercadonaScrapper.get_invoice(text)
-        else:
-            raise SystemExit("Unsupported invoice format or supermarket.")
+        return Invoice(
+            supermarket=cls.SUPERMARKET,
+            products=cls._get_products(text),
+            invoice_number=cls._get_invoice_number(text),
+            payment_date=cls._get_payment_date(text),
+            total=cls._get_invoice_total(text),
+        )
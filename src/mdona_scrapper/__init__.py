@@ -9,6 +9,14 @@ from models import Invoice, Product
 
 
 class MercadonaScrapper(InvoiceScrapper):
+    SUPERMARKET = "Mercadona"
+    PRODUCT_PARSERS = (
+        "_get_special_products",
+        "_get_normal_products",
+        "_get_unitary_invoice_products",
+        "_get_multiple_invoice_products",
+    )
+
     INVOICE_NUMBER_RE = re.compile(
         r"^Factura \w+:\s*([0-9\- ]+)", re.IGNORECASE | re.MULTILINE
     )
@@ -138,20 +146,6 @@ class MercadonaScrapper(InvoiceScrapper):
             ) in cls.MULTIPLE_INVOICE_PRODUCT_RE.findall(text)
         ]
 
-    @classmethod
-    def _get_invoice_products(cls, text) -> List[Product]:
-        return cls._get_unitary_invoice_products(
-            text
-        ) + cls._get_multiple_invoice_products(text)
-
-    @classmethod
-    def _get_products(cls, text) -> List[Product]:
-        return (
-            cls._get_special_products(text)
-            + cls._get_normal_products(text)
-            + cls._get_invoice_products(text)
-        )
-
     @classmethod
     def _get_invoice_number(cls, text) -> str:
         if (match := cls.INVOICE_NUMBER_RE.search(text)) is None:
@@ -181,11 +175,4 @@ class MercadonaScrapper(InvoiceScrapper):
 
     @classmethod
     def get_invoice(cls, text: str) -> Invoice:
-
-        return Invoice(
-            supermarket=cls.supermarket,
-            products=cls._get_products(text),
-            invoice_number=cls._get_invoice_number(text),
-            payment_date=cls._get_payment_date(text),
-            total=cls._get_invoice_total(text),
-        )
+        return cls.parse_invoice(text)
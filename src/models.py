@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import List
 
@@ -24,6 +24,11 @@ class Invoice:
     payment_date: datetime
     total: float = 0.0
 
+    def to_dict(self) -> dict:
+        invoice = asdict(self)
+        invoice["payment_date"] = self.payment_date.isoformat()
+        return invoice
+
     @property
     def dataframe(self):
         return pd.DataFrame(
@@ -0,0 +1,187 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from importlib import import_module
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from invoice_scrapper import InvoiceScrapper
+from models import Invoice
+
+# Corpus layout: <case>.txt holds the extracted invoice text and <case>.json
+# the expected Invoice.to_dict() output.
+TEXT_SUFFIX = ".txt"
+EXPECTED_SUFFIX = ".json"
+
+
+PARSERS: Dict[str, Callable[[str], Invoice]] = {
+    "regex": InvoiceScrapper.parse_text,
+}
+
+
+@lru_cache(maxsize=None)
+def resolve_parser(name: str) -> Callable[[str], Invoice]:
+    """Built-in parser name or ``module:attribute.path`` callable."""
+    if name in PARSERS:
+        return PARSERS[name]
+    module, sep, path = name.partition(":")
+    if not sep:
+        raise SystemExit(f"Unknown parser: {name}.  Use one of {list(PARSERS)}")
+    parser = import_module(module)
+    for attr in path.split("."):
+        parser = getattr(parser, attr)
+    return parser
+
+
+def iter_corpus(corpus: str) -> Iterator[Tuple[str, str]]:
+    """Yield (text file, expected file) pairs, sorted by case name."""
+    for text_file in sorted(Path(corpus).rglob(f"*{TEXT_SUFFIX}")):
+        case = text_file.parent / text_file.name[: -len(TEXT_SUFFIX)]
+        yield str(text_file), str(case.parent / (case.name + EXPECTED_SUFFIX))
+
+
+def record_case(invoice_file: str, corpus: str, parser: str = "regex") -> str:
+    """Store the extracted text of an invoice file and its parsed Invoice.
+
+    The case is named after the invoice file name without its last suffix,
+    existing cases are never overwritten.
+    """
+    base = Path(corpus) / Path(invoice_file).stem
+    text_file = base.parent / (base.name + TEXT_SUFFIX)
+    expected_file = base.parent / (base.name + EXPECTED_SUFFIX)
+    if text_file.exists() or expected_file.exists():
+        raise SystemExit(logger.error(f"Corpus case already exists: {text_file}"))
+
+    text = InvoiceScrapper.read_invoice_file(invoice_file)
+    expected = resolve_parser(parser)(text).to_dict()
+    base.parent.mkdir(parents=True, exist_ok=True)
+    text_file.write_text(text, encoding="utf-8")
+    expected_file.write_text(
+        json.dumps(expected, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return str(text_file)
+
+
+def diff_invoices(left: Optional[dict], right: Optional[dict]) -> List[str]:
+    """Fields that differ between two Invoice.to_dict() outputs."""
+    if left is None or right is None:
+        return [] if left == right else ["invoice"]
+    diffs = [
+        key
+        for key in sorted(set(left) | set(right))
+        if key != "products" and left.get(key) != right.get(key)
+    ]
+    left_products, right_products = left.get("products", []), right.get("products", [])
+    if len(left_products) != len(right_products):
+        diffs.append(f"products[len {len(left_products)} != {len(right_products)}]")
+    else:
+        diffs += [
+            f"products[{i}]"
+            for i, (a, b) in enumerate(zip(left_products, right_products))
+            if a != b
+        ]
+    return diffs
+
+
+@dataclass
+class CaseResult:
+    case: str
+    # parser -> Invoice.to_dict() or None when it failed
+    invoices: Dict[str, Optional[dict]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    seconds: Dict[str, float] = field(default_factory=dict)
+    # parser -> differing fields against the expected invoice
+    expected_diffs: Dict[str, List[str]] = field(default_factory=dict)
+    # differing fields between the first and second parser
+    parser_diffs: List[str] = field(default_factory=list)
+    expected_missing: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not (
+            self.errors
+            or self.parser_diffs
+            or self.expected_missing
+            or any(self.expected_diffs.values())
+        )
+
+
+def run_case(
+    case: Tuple[str, str], parsers: Tuple[str, ...], reverse: bool = False
+) -> CaseResult:
+    """Parse one corpus case with every parser; executed in worker processes.
+
+    ``reverse`` runs the parsers in reverse order, so that alternating it
+    between cases does not favour any parser in the timings.
+    """
+    text_file, expected_file = case
+    text = Path(text_file).read_text(encoding="utf-8")
+    result = CaseResult(case=text_file)
+
+    for name in reversed(parsers) if reverse else parsers:
+        parser = resolve_parser(name)
+        start = time.perf_counter()
+        try:
+            result.invoices[name] = parser(text).to_dict()
+        # Scrappers exit on regex missmatch, keep going with the next case.
+        except (Exception, SystemExit) as e:
+            result.invoices[name] = None
+            result.errors[name] = f"{type(e).__name__}: {e}"
+        result.seconds[name] = time.perf_counter() - start
+
+    if not Path(expected_file).exists():
+        result.expected_missing = True
+    else:
+        expected = json.loads(Path(expected_file).read_text(encoding="utf-8"))
+        result.expected_diffs = {
+            name: diff_invoices(expected, invoice)
+            for name, invoice in result.invoices.items()
+        }
+    if len(parsers) > 1:
+        result.parser_diffs = diff_invoices(
+            result.invoices[parsers[0]], result.invoices[parsers[1]]
+        )
+    return result
+
+
+def _warm_up(parsers: Tuple[str, ...], text: str) -> None:
+    """Worker initializer: import and run every parser once before timing."""
+    for name in parsers:
+        try:
+            resolve_parser(name)(text)
+        except (Exception, SystemExit):
+            pass
+
+
+def _run_indexed_case(
+    indexed_case: Tuple[int, Tuple[str, str]], parsers: Tuple[str, ...]
+) -> CaseResult:
+    index, case = indexed_case
+    return run_case(case, parsers, reverse=index % 2 == 1)
+
+
+def run_corpus(
+    corpus: str, parsers: Tuple[str, ...], workers: Optional[int] = None
+) -> Iterator[CaseResult]:
+    """Run every corpus case in a pool of worker processes, in corpus order.
+
+    Workers warm up every parser on the first case, and the parser running
+    first alternates between cases.
+    """
+    cases = list(iter_corpus(corpus))
+    if not cases:
+        return
+    warm_up_text = Path(cases[0][0]).read_text(encoding="utf-8")
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_warm_up, initargs=(parsers, warm_up_text)
+    ) as executor:
+        yield from executor.map(
+            partial(_run_indexed_case, parsers=parsers),
+            enumerate(cases),
+            chunksize=32,
+        )
@@ -0,0 +1,142 @@
+import json
+import os
+import uuid
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+ID_FIELDS = ("budget_id", "account_id", "category_id", "sub_category_id", "payee_id")
+# YNAB budget_id also accepts these aliases.
+BUDGET_ALIASES = ("last-used", "default")
+
+
+@dataclass
+class Route:
+    """YNAB destination for invoices of a supermarket and/or source folder."""
+
+    budget_id: str
+    account_id: str
+    category_id: str
+    sub_category_id: str
+    payee_id: str
+    supermarket: Optional[str] = None
+    folder: Optional[str] = None
+
+    def invalid_ids(self) -> List[str]:
+        """ID fields not holding a UUID."""
+        invalid = []
+        for name in ID_FIELDS:
+            value = getattr(self, name)
+            if name == "budget_id" and value in BUDGET_ALIASES:
+                continue
+            try:
+                uuid.UUID(str(value))
+            except ValueError:
+                invalid.append(name)
+        return invalid
+
+    def matches(self, supermarket: str, invoice_file: str) -> bool:
+        if self.supermarket and self.supermarket.lower() != supermarket.lower():
+            return False
+        if self.folder:
+            folder = Path(self.folder).resolve()
+            return folder in Path(invoice_file).resolve().parents
+        return True
+
+
+class Router:
+    """Pick a Route for each invoice, first match wins.
+
+    Routing file format (JSON), ``defaults`` are merged into every route and
+    relative ``folder`` paths are resolved against the routing file folder:
+
+        {
+            "defaults": {"category_id": "...", "sub_category_id": "..."},
+            "routes": [
+                {"supermarket": "Consum", "folder": "invoices/home",
+                 "budget_id": "...", "account_id": "...", "payee_id": "..."}
+            ]
+        }
+    """
+
+    def __init__(self, routes: List[Route]):
+        self.routes = routes
+
+    @classmethod
+    def from_file(cls, path: str) -> "Router":
+        try:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise SystemExit(logger.error(f"Error reading routing file {path}: {e}"))
+
+        if not (
+            isinstance(config, dict)
+            and isinstance(config.get("defaults", {}), dict)
+            and isinstance(config.get("routes", []), list)
+        ):
+            raise SystemExit(
+                logger.error(
+                    f"Routing file {path} must be an object with defaults and routes."
+                )
+            )
+
+        defaults = config.get("defaults", {})
+        known = {f.name for f in fields(Route)}
+        routes = []
+        for i, entry in enumerate(config.get("routes", [])):
+            if not isinstance(entry, dict):
+                raise SystemExit(logger.error(f"Invalid route #{i}: {entry!r}"))
+            entry = {**defaults, **entry}
+            if unknown := set(entry) - known:
+                raise SystemExit(
+                    logger.error(f"Unknown keys in route #{i}: {sorted(unknown)}")
+                )
+            if entry.get("folder"):
+                entry["folder"] = str(Path(path).parent / entry["folder"])
+            try:
+                route = Route(**entry)
+            except TypeError as e:
+                raise SystemExit(logger.error(f"Invalid route #{i}: {e}"))
+            if invalid := route.invalid_ids():
+                raise SystemExit(logger.error(f"Invalid ids in route #{i}: {invalid}"))
+            routes.append(route)
+        return cls(routes)
+
+    @classmethod
+    def from_env(cls) -> "Router":
+        """Single budget routing from BUDGET_ID, ACCOUNT_ID, ... variables."""
+        try:
+            common = dict(
+                budget_id=os.environ["BUDGET_ID"],
+                account_id=os.environ["ACCOUNT_ID"],
+                category_id=os.environ["CATEGORY_ID"],
+                sub_category_id=os.environ["SUB_CATEGORY_ID"],
+            )
+        except KeyError as e:
+            raise SystemExit(logger.error(f"Please set environment variables: {e}"))
+
+        routes = [
+            Route(supermarket=supermarket, payee_id=payee_id, **common)
+            for supermarket, env in (
+                ("Consum", "PAYEE_ID_CONSUM"),
+                ("Mercadona", "PAYEE_ID_MERCADONA"),
+            )
+            if (payee_id := os.environ.get(env))
+        ]
+        for route in routes:
+            if invalid := route.invalid_ids():
+                raise SystemExit(
+                    logger.error(f"Invalid ids in {route.supermarket} route: {invalid}")
+                )
+        return cls(routes)
+
+    def route(self, supermarket: str, invoice_file: str) -> Route:
+        for route in self.routes:
+            if route.matches(supermarket, invoice_file):
+                return route
+        raise SystemExit(
+            logger.error(f"No route for {supermarket} invoice: {invoice_file}")
+        )
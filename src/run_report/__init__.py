@@ -0,0 +1,75 @@
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional, TextIO
+
+from loguru import logger
+
+
+@dataclass
+class InvoiceReport:
+    """Per invoice run record."""
+
+    file: str
+    supermarket: str = ""
+    budget_id: str = ""
+    items: int = 0
+    total: float = 0.0
+    sum_total: float = 0.0
+    durations: Dict[str, float] = field(default_factory=dict)
+    result: str = "pending"
+    error: str = ""
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a processing stage, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = round(time.perf_counter() - start, 6)
+
+    @contextmanager
+    def capture_errors(self):
+        """Copy the error messages logged meanwhile into ``error``."""
+        errors = []
+        handler = logger.add(
+            lambda message: errors.append(message.record["message"]), level="ERROR"
+        )
+        try:
+            yield
+        finally:
+            logger.remove(handler)
+            if errors:
+                self.error = "; ".join(([self.error] if self.error else []) + errors)
+
+
+class ReportWriter:
+    """Stream InvoiceReport records as JSON lines.
+
+    The report file is opened in append mode and every record is flushed
+    as soon as it is written, so histories are never loaded in memory.
+    Without a path the writer does nothing.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._fh: Optional[TextIO] = None
+
+    def __enter__(self) -> "ReportWriter":
+        if self.path:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def write(self, report: InvoiceReport) -> None:
+        if self._fh is None:
+            return
+        record = {"timestamp": round(time.time(), 3), **asdict(report)}
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
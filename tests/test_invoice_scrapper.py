@@ -0,0 +1,122 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import invoice_scrapper
+from consum_scrapper import ConsumScrapper
+from invoice_scrapper import InvoiceScrapper, load_scrappers
+from mdona_scrapper import MercadonaScrapper
+
+CONSUM_TEXT = """CONSUM S. COOP. V.
+C/ Mayor 12
+C:123 45/678 01.02.2024 10:30 999
+1 LECHE ENTERA 0,89
+3 YOGUR 0,50 1,50
+IMPORTE A ABONAR 2,39
+"""
+
+MERCADONA_TEXT = """MERCADONA, S.A. A-46103834
+21/05/2025 19:05 OP: 123456
+FACTURA SIMPLIFICADA: 2345-012-123456
+1 LECHE ENTERA 0,89
+2 YOGUR 0,75 1,50
+1 PLATANO
+1,250 kg 2,00 €/kg 2,50
+TOTAL (€) 4,89
+"""
+
+
+@pytest.fixture
+def scrappers_cache():
+    load_scrappers.cache_clear()
+    yield
+    load_scrappers.cache_clear()
+
+
+def test_parse_consum():
+    invoice = InvoiceScrapper.parse_text(CONSUM_TEXT)
+
+    assert invoice.supermarket == "Consum"
+    assert invoice.invoice_number == "C:123 45/678 - 999"
+    assert invoice.payment_date == datetime(2024, 2, 1, 10, 30)
+    assert invoice.total == 2.39
+    assert [p.name for p in invoice.products] == ["LECHE ENTERA", "YOGUR"]
+
+
+def test_parse_mercadona():
+    invoice = InvoiceScrapper.parse_text(MERCADONA_TEXT)
+
+    assert invoice.supermarket == "Mercadona"
+    assert invoice.payment_date == datetime(2025, 5, 21)
+    assert invoice.total == 4.89
+    assert round(sum(p.total_price for p in invoice.products), 2) == invoice.total
+
+
+def test_zero_value_lines_are_kept_on_repeated_layouts():
+    first = InvoiceScrapper.parse_text(CONSUM_TEXT)
+    text = CONSUM_TEXT.replace(
+        "IMPORTE A ABONAR", "Descuento promo 0,00\nIMPORTE A ABONAR"
+    )
+
+    second = InvoiceScrapper.parse_text(text)
+
+    assert len(second.products) == len(first.products) + 1
+    assert second.products[-1].name == "Descuento promo"
+    assert second == ConsumScrapper.get_invoice(text)
+
+
+def test_unsupported_supermarket():
+    with pytest.raises(SystemExit):
+        InvoiceScrapper.parse_text("Lidl\nTOTAL 1,00")
+
+
+def test_builtin_scrappers_order(scrappers_cache):
+    assert load_scrappers()[:2] == (ConsumScrapper, MercadonaScrapper)
+
+
+def _entry_points(*eps):
+    return lambda: SimpleNamespace(select=lambda group: list(eps))
+
+
+def _entry_point(name, load):
+    return SimpleNamespace(name=name, load=load)
+
+
+def test_entry_point_scrappers(monkeypatch, scrappers_cache):
+    class LidlScrapper(InvoiceScrapper):
+        SUPERMARKET = "Lidl"
+
+    monkeypatch.setattr(
+        invoice_scrapper,
+        "entry_points",
+        _entry_points(_entry_point("lidl", lambda: LidlScrapper)),
+    )
+
+    assert load_scrappers() == (ConsumScrapper, MercadonaScrapper, LidlScrapper)
+
+
+def test_broken_entry_point_is_skipped(monkeypatch, scrappers_cache):
+    def broken():
+        raise ImportError("No module named 'lidl_scrapper'")
+
+    monkeypatch.setattr(
+        invoice_scrapper,
+        "entry_points",
+        _entry_points(_entry_point("lidl", broken)),
+    )
+
+    assert load_scrappers() == (ConsumScrapper, MercadonaScrapper)
+    assert InvoiceScrapper.parse_text(CONSUM_TEXT).supermarket == "Consum"
+
+
+@pytest.mark.parametrize("target", [lambda text: None, dict], ids=["function", "class"])
+def test_entry_point_not_a_scrapper_is_skipped(monkeypatch, scrappers_cache, target):
+    monkeypatch.setattr(
+        invoice_scrapper,
+        "entry_points",
+        _entry_points(_entry_point("lidl", lambda: target)),
+    )
+
+    assert load_scrappers()[:2] == (ConsumScrapper, MercadonaScrapper)
+    assert InvoiceScrapper.parse_text(CONSUM_TEXT).supermarket == "Consum"
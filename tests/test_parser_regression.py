@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from invoice_scrapper import InvoiceScrapper
+from parser_regression import (
+    diff_invoices,
+    iter_corpus,
+    record_case,
+    run_case,
+    run_corpus,
+)
+
+CORPUS = Path(__file__).parent / "corpus"
+CASES = list(iter_corpus(str(CORPUS)))
+
+
+def test_corpus_is_not_empty():
+    assert len(CASES) >= 4
+    assert all(Path(expected).exists() for _, expected in CASES)
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: Path(case[0]).stem)
+def test_corpus_case(case):
+    result = run_case(case, ("regex", "invoice_scrapper:InvoiceScrapper.parse_text"))
+
+    assert result.errors == {}
+    assert all(diffs == [] for diffs in result.expected_diffs.values())
+    assert result.parser_diffs == []
+    assert result.ok
+
+
+def test_run_case_reports_mismatch(tmp_path):
+    text_file, expected_file = CASES[0]
+    expected = json.loads(Path(expected_file).read_text(encoding="utf-8"))
+    expected["total"] += 1
+    expected["products"][0]["name"] = "OTHER"
+    (tmp_path / "case.txt").write_text(Path(text_file).read_text(encoding="utf-8"))
+    (tmp_path / "case.json").write_text(json.dumps(expected))
+
+    result = run_case(
+        (str(tmp_path / "case.txt"), str(tmp_path / "case.json")), ("regex",)
+    )
+
+    assert not result.ok
+    assert result.expected_diffs == {"regex": ["total", "products[0]"]}
+
+
+def test_run_case_reports_parser_errors(tmp_path):
+    (tmp_path / "case.txt").write_text("Lidl\nTOTAL 1,00")
+
+    result = run_case(
+        (str(tmp_path / "case.txt"), str(tmp_path / "case.json")), ("regex",)
+    )
+
+    assert not result.ok
+    assert result.invoices == {"regex": None}
+    assert "SystemExit" in result.errors["regex"]
+
+
+def test_diff_invoices():
+    invoice = InvoiceScrapper.parse_text(Path(CASES[0][0]).read_text()).to_dict()
+    shorter = {**invoice, "products": invoice["products"][:-1]}
+
+    assert diff_invoices(invoice, invoice) == []
+    assert diff_invoices(invoice, None) == ["invoice"]
+    assert diff_invoices(None, None) == []
+    assert diff_invoices(invoice, shorter) == [
+        f"products[len {len(invoice['products'])} != {len(shorter['products'])}]"
+    ]
+
+
+def test_iter_corpus_keeps_dotted_names(tmp_path):
+    (tmp_path / "ticket.2024.01.txt").write_text("")
+
+    assert list(iter_corpus(str(tmp_path))) == [
+        (str(tmp_path / "ticket.2024.01.txt"), str(tmp_path / "ticket.2024.01.json"))
+    ]
+
+
+def test_record_case_refuses_to_overwrite(tmp_path, monkeypatch):
+    text = Path(CASES[0][0]).read_text(encoding="utf-8")
+    monkeypatch.setattr(InvoiceScrapper, "read_invoice_file", lambda file: text)
+
+    recorded = record_case("in/ticket.2024.01.pdf", str(tmp_path))
+
+    assert recorded == str(tmp_path / "ticket.2024.01.txt")
+    assert (tmp_path / "ticket.2024.01.json").exists()
+    with pytest.raises(SystemExit):
+        record_case("other/ticket.2024.01.pdf", str(tmp_path))
+
+
+def test_run_case_missing_expected(tmp_path):
+    (tmp_path / "case.txt").write_text(Path(CASES[0][0]).read_text(encoding="utf-8"))
+
+    result = run_case(
+        (str(tmp_path / "case.txt"), str(tmp_path / "case.json")), ("regex",)
+    )
+
+    assert result.errors == {}
+    assert result.expected_missing
+    assert not result.ok
+
+
+def test_run_case_reverse_order():
+    result = run_case(
+        CASES[0], ("regex", "invoice_scrapper:InvoiceScrapper.parse_text"), True
+    )
+
+    assert list(result.invoices) == [
+        "invoice_scrapper:InvoiceScrapper.parse_text",
+        "regex",
+    ]
+    assert result.ok
+
+
+def test_run_corpus():
+    results = list(run_corpus(str(CORPUS), ("regex",), workers=2))
+
+    assert [result.case for result in results] == [case for case, _ in CASES]
+    assert all(result.ok for result in results)
+
+
+def test_run_corpus_empty(tmp_path):
+    assert list(run_corpus(str(tmp_path), ("regex",))) == []
@@ -0,0 +1,127 @@
+import json
+import uuid
+
+import pytest
+
+from routing import Route, Router
+
+IDS = {
+    "budget_id": str(uuid.uuid4()),
+    "account_id": str(uuid.uuid4()),
+    "category_id": str(uuid.uuid4()),
+    "sub_category_id": str(uuid.uuid4()),
+}
+PAYEE_ID = str(uuid.uuid4())
+
+
+def write_routes(tmp_path, config):
+    path = tmp_path / "routes.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_from_file(tmp_path):
+    other_budget = str(uuid.uuid4())
+    path = write_routes(
+        tmp_path,
+        {
+            "defaults": IDS,
+            "routes": [
+                {"supermarket": "Consum", "folder": "home", "payee_id": PAYEE_ID},
+                {"budget_id": other_budget, "payee_id": PAYEE_ID},
+            ],
+        },
+    )
+
+    router = Router.from_file(path)
+
+    assert [route.budget_id for route in router.routes] == [
+        IDS["budget_id"],
+        other_budget,
+    ]
+    assert router.routes[0].folder == str(tmp_path / "home")
+
+
+def test_first_match_wins(tmp_path, monkeypatch):
+    (tmp_path / "home").mkdir()
+    other_budget = str(uuid.uuid4())
+    path = write_routes(
+        tmp_path,
+        {
+            "defaults": {**IDS, "payee_id": PAYEE_ID},
+            "routes": [
+                {"supermarket": "Consum", "folder": "home"},
+                {"budget_id": other_budget},
+                {"supermarket": "Mercadona", "budget_id": "last-used"},
+            ],
+        },
+    )
+    # Folders follow the routing file, not the working directory.
+    monkeypatch.chdir(tmp_path / "home")
+    router = Router.from_file(path)
+
+    assert (
+        router.route("consum", str(tmp_path / "home/a.pdf")).budget_id
+        == (IDS["budget_id"])
+    )
+    assert router.route("Consum", str(tmp_path / "b.pdf")).budget_id == other_budget
+    assert router.route("Mercadona", "a.pdf").budget_id == other_budget
+
+
+def test_no_route():
+    with pytest.raises(SystemExit):
+        Router([]).route("Consum", "a.pdf")
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        [],
+        {"routes": {}},
+        {"defaults": [], "routes": []},
+        {"routes": ["route"]},
+        {"routes": [{**IDS, "payee_id": PAYEE_ID, "store": "x"}]},
+        {"routes": [IDS]},
+        {"routes": [{**IDS, "payee_id": "payee"}]},
+    ],
+    ids=[
+        "not-object",
+        "routes-not-list",
+        "defaults-not-object",
+        "route-not-object",
+        "unknown-key",
+        "missing-key",
+        "invalid-id",
+    ],
+)
+def test_from_file_invalid(tmp_path, config):
+    with pytest.raises(SystemExit):
+        Router.from_file(write_routes(tmp_path, config))
+
+
+def test_from_file_not_json(tmp_path):
+    path = tmp_path / "routes.json"
+    path.write_text("{")
+
+    with pytest.raises(SystemExit):
+        Router.from_file(str(path))
+
+
+def test_from_env(monkeypatch):
+    for name, value in IDS.items():
+        monkeypatch.setenv(name.upper(), value)
+    monkeypatch.setenv("PAYEE_ID_MERCADONA", PAYEE_ID)
+    monkeypatch.delenv("PAYEE_ID_CONSUM", raising=False)
+
+    router = Router.from_env()
+
+    assert router.routes == [Route(supermarket="Mercadona", payee_id=PAYEE_ID, **IDS)]
+    with pytest.raises(SystemExit):
+        router.route("Consum", "a.pdf")
+
+
+def test_from_env_missing(monkeypatch):
+    monkeypatch.delenv("BUDGET_ID", raising=False)
+
+    with pytest.raises(SystemExit):
+        Router.from_env()
@@ -0,0 +1,52 @@
+import json
+
+from loguru import logger
+
+from run_report import InvoiceReport, ReportWriter
+
+
+def test_report_writer_appends_lines(tmp_path):
+    path = tmp_path / "report.jsonl"
+    path.write_text('{"file": "old.pdf"}\n')
+
+    with ReportWriter(str(path)) as writer:
+        writer.write(InvoiceReport(file="a.pdf", result="submitted"))
+        # Flushed as soon as it is written.
+        assert len(path.read_text().splitlines()) == 2
+        writer.write(InvoiceReport(file="b.pdf", result="error"))
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["file"] for r in records] == ["old.pdf", "a.pdf", "b.pdf"]
+    assert records[2]["result"] == "error"
+    assert "timestamp" in records[1]
+
+
+def test_report_writer_without_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    with ReportWriter() as writer:
+        writer.write(InvoiceReport(file="a.pdf"))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stage_durations():
+    report = InvoiceReport(file="a.pdf")
+
+    with report.stage("read"):
+        pass
+
+    assert set(report.durations) == {"read"}
+    assert report.durations["read"] >= 0
+
+
+def test_capture_errors():
+    report = InvoiceReport(file="a.pdf")
+
+    with report.capture_errors():
+        logger.warning("not an error")
+        logger.error("File not found: a.pdf")
+        logger.error("Second error")
+    logger.error("After the capture")
+
+    assert report.error == "File not found: a.pdf; Second error"